@@ -0,0 +1,149 @@
+"""Admission control: per-client rate limiting, concurrency capping and load shedding.
+
+Counters are kept in memory, so limits and metrics apply per worker process.
+All state is touched only from the event loop, so no locking is needed.
+"""
+
+import math
+import os
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.config import settings
+from app.database import engine
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client and route, refilled at `rate` tokens per second."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """Take a token for `key`. Returns 0 if allowed, else seconds until one is available."""
+        now = self.clock()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+@dataclass
+class AdmissionStats:
+    """Per-process admission control counters."""
+
+    in_flight: int = 0
+    rate_limited: int = 0
+    concurrency_rejected: int = 0
+    pool_timeouts: int = 0
+
+
+rate_limiter = (
+    TokenBucketLimiter(settings.rate_limit_per_second, settings.rate_limit_burst)
+    if settings.rate_limit_per_second
+    else None
+)
+stats = AdmissionStats()
+
+
+def client_identity(request: Request) -> str:
+    """Identify the caller by a known API key, falling back to client IP.
+
+    Unknown keys are ignored so callers cannot get a fresh bucket by
+    rotating the header.
+    """
+    api_key = request.headers.get("X-API-Key")
+    if api_key and api_key in settings.rate_limit_api_keys:
+        return f"key:{api_key}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def _overloaded(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(settings.shed_retry_after)},
+    )
+
+
+async def rate_limit(request: Request) -> None:
+    """Reject the request with 429 once the client exceeds its rate for this route."""
+    if rate_limiter is None:
+        return
+    route = request.scope.get("route")
+    path = route.path if route is not None else request.url.path
+    retry_after = rate_limiter.acquire(f"{client_identity(request)}:{request.method}:{path}")
+    if retry_after:
+        stats.rate_limited += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+async def limit_concurrency() -> AsyncGenerator[None, None]:
+    """Reject the request with 503 once too many are already in flight.
+
+    Runs on the event loop before any threadpool work, so excess requests
+    are turned away immediately instead of queueing for a thread.
+    """
+    if stats.in_flight >= settings.max_concurrent_requests:
+        stats.concurrency_rejected += 1
+        raise _overloaded("Too many concurrent requests, try again later")
+    stats.in_flight += 1
+    try:
+        yield
+    finally:
+        stats.in_flight -= 1
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """Shed load with 503 when waiting for a database connection exceeds the pool timeout."""
+    stats.pool_timeouts += 1
+    error = _overloaded("Service overloaded, try again later")
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"detail": error.detail},
+        headers=error.headers,
+    )
+
+
+def admission_metrics() -> dict:
+    """Snapshot of this worker's admission control counters and database pool usage."""
+    pool = engine.pool
+    return {
+        "pid": os.getpid(),
+        "in_flight_requests": stats.in_flight,
+        "rate_limited_requests": stats.rate_limited,
+        "concurrency_rejected_requests": stats.concurrency_rejected,
+        "pool_timeout_requests": stats.pool_timeouts,
+        "db_pool": {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        },
+    }
@@ -3,7 +3,10 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
+from app.admission import admission_metrics, pool_timeout_handler
+from app.config import settings
 from app.database import Base, engine
 from app.routers import vouchers
 
@@ -13,9 +16,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Create database tables on startup.
 
     Uses asyncio.to_thread to run synchronous database operations
-    in a thread pool, making it properly async.
+    in a thread pool, making it properly async. Skipped when the
+    server entry point has already created them before starting workers.
     """
-    await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+    if settings.create_tables_on_startup:
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
     yield
 
 
@@ -26,6 +31,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
 app.include_router(vouchers.router)
 
 
@@ -33,3 +39,9 @@ app.include_router(vouchers.router)
 def health_check() -> dict:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", tags=["health"])
+def metrics() -> dict:
+    """Admission control counters and database pool usage."""
+    return admission_metrics()
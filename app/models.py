@@ -1,8 +1,17 @@
 import secrets
 import string
 from datetime import UTC, datetime
+from enum import StrEnum
 
-from sqlalchemy import Boolean, CheckConstraint, DateTime, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -40,3 +49,31 @@ class Voucher(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utc_now, onupdate=utc_now
     )
+
+
+class ChangeOperation(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DEACTIVATED = "deactivated"
+    REACTIVATED = "reactivated"
+
+
+class VoucherChange(Base):
+    """Append-only outbox of voucher mutations, ordered by seq."""
+
+    __tablename__ = "voucher_changes"
+    __table_args__ = (
+        CheckConstraint(
+            "operation IN ('created', 'updated', 'deactivated', 'reactivated')",
+            name="check_operation_valid",
+        ),
+    )
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    voucher_id: Mapped[int] = mapped_column(ForeignKey("vouchers.id"), nullable=False, index=True)
+    code: Mapped[str] = mapped_column(String(12), nullable=False)
+    operation: Mapped[str] = mapped_column(String(16), nullable=False)
+    discount_percent: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now)
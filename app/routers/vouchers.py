@@ -1,20 +1,33 @@
+import asyncio
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Query as SQLAlchemyQuery
 from sqlalchemy.orm import Session
 
+from app.admission import limit_concurrency, rate_limit
 from app.database import get_db
-from app.models import Voucher
+from app.models import ChangeOperation, Voucher, VoucherChange
 from app.schemas import (
     PaginatedVouchersResponse,
+    VoucherChangeResponse,
+    VoucherChangesResponse,
     VoucherCreate,
     VoucherResponse,
     VoucherUpdate,
 )
 
-router = APIRouter(prefix="/vouchers", tags=["vouchers"])
+router = APIRouter(
+    prefix="/vouchers",
+    tags=["vouchers"],
+    dependencies=[Depends(rate_limit)],
+)
+
+# Serializes change feed writers so seq values become visible in commit order
+# and a consumer reading `since=N` never skips a change committed later.
+CHANGE_FEED_LOCK_ID = 0x766F7563  # "vouc"
+CHANGES_POLL_INTERVAL = 0.5
 
 
 def _active_vouchers_query(db: Session) -> SQLAlchemyQuery[Voucher]:
@@ -23,7 +36,42 @@ def _active_vouchers_query(db: Session) -> SQLAlchemyQuery[Voucher]:
     return db.query(Voucher).filter(Voucher.is_active.is_(True), Voucher.expires_at > now)
 
 
-@router.post("/", response_model=VoucherResponse, status_code=status.HTTP_201_CREATED)
+def _record_change(db: Session, voucher: Voucher, operation: ChangeOperation) -> None:
+    """Append a snapshot of the voucher to the change feed in the current transaction."""
+    db.execute(select(func.pg_advisory_xact_lock(CHANGE_FEED_LOCK_ID)))
+    db.flush()
+    db.add(
+        VoucherChange(
+            voucher_id=voucher.id,
+            code=voucher.code,
+            operation=operation,
+            discount_percent=voucher.discount_percent,
+            expires_at=voucher.expires_at,
+            is_active=voucher.is_active,
+        )
+    )
+
+
+def _fetch_changes(db: Session, since: int, limit: int) -> list[VoucherChangeResponse]:
+    """Fetch changes after `since` and end the transaction to release the connection."""
+    changes = (
+        db.query(VoucherChange)
+        .filter(VoucherChange.seq > since)
+        .order_by(VoucherChange.seq)
+        .limit(limit)
+        .all()
+    )
+    snapshot = [VoucherChangeResponse.model_validate(change) for change in changes]
+    db.commit()
+    return snapshot
+
+
+@router.post(
+    "/",
+    response_model=VoucherResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_concurrency)],
+)
 def create_voucher(voucher_in: VoucherCreate, db: Session = Depends(get_db)) -> Voucher:
     """Create a new voucher with an auto-generated code."""
     voucher = Voucher(
@@ -31,12 +79,15 @@ def create_voucher(voucher_in: VoucherCreate, db: Session = Depends(get_db)) ->
         expires_at=voucher_in.expires_at,
     )
     db.add(voucher)
+    _record_change(db, voucher, ChangeOperation.CREATED)
     db.commit()
     db.refresh(voucher)
     return voucher
 
 
-@router.get("/", response_model=PaginatedVouchersResponse)
+@router.get(
+    "/", response_model=PaginatedVouchersResponse, dependencies=[Depends(limit_concurrency)]
+)
 def list_vouchers(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of records to return"),
@@ -59,7 +110,33 @@ def list_vouchers(
     }
 
 
-@router.get("/{code}", response_model=VoucherResponse)
+# Not concurrency limited: long-polls hold no DB connection while they wait and
+# would otherwise use up the in-flight slots that lookups need.
+@router.get("/changes", response_model=VoucherChangesResponse)
+async def list_voucher_changes(
+    since: int = Query(0, ge=0, description="Return changes with seq greater than this"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of changes to return"),
+    wait: float = Query(0, ge=0, le=30, description="Seconds to long-poll for new changes"),
+    db: Session = Depends(get_db),
+) -> dict:
+    """List voucher creations, updates, deactivations and reactivations in commit order.
+
+    With `wait`, blocks until at least one change is available or the timeout
+    elapses. The database connection is released between polls.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    changes = await asyncio.to_thread(_fetch_changes, db, since, limit)
+    while not changes and loop.time() < deadline:
+        await asyncio.sleep(min(CHANGES_POLL_INTERVAL, deadline - loop.time()))
+        changes = await asyncio.to_thread(_fetch_changes, db, since, limit)
+    return {
+        "items": changes,
+        "next_since": changes[-1].seq if changes else since,
+    }
+
+
+@router.get("/{code}", response_model=VoucherResponse, dependencies=[Depends(limit_concurrency)])
 def get_voucher(code: str, db: Session = Depends(get_db)) -> Voucher:
     """Retrieve an active, non-expired voucher by its code."""
     voucher = _active_vouchers_query(db).filter(Voucher.code == code).first()
@@ -71,7 +148,7 @@ def get_voucher(code: str, db: Session = Depends(get_db)) -> Voucher:
     return voucher
 
 
-@router.patch("/{code}", response_model=VoucherResponse)
+@router.patch("/{code}", response_model=VoucherResponse, dependencies=[Depends(limit_concurrency)])
 def update_voucher(code: str, voucher_in: VoucherUpdate, db: Session = Depends(get_db)) -> Voucher:
     """Update an existing voucher with pessimistic locking."""
     voucher = db.query(Voucher).filter(Voucher.code == code).with_for_update().first()
@@ -81,16 +158,27 @@ def update_voucher(code: str, voucher_in: VoucherUpdate, db: Session = Depends(g
             detail=f"Voucher with code '{code}' not found",
         )
 
+    was_active = voucher.is_active
     update_data = voucher_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(voucher, field, value)
 
+    if db.is_modified(voucher):
+        if was_active and not voucher.is_active:
+            operation = ChangeOperation.DEACTIVATED
+        elif not was_active and voucher.is_active:
+            operation = ChangeOperation.REACTIVATED
+        else:
+            operation = ChangeOperation.UPDATED
+        _record_change(db, voucher, operation)
     db.commit()
     db.refresh(voucher)
     return voucher
 
 
-@router.delete("/{code}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{code}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(limit_concurrency)]
+)
 def deactivate_voucher(code: str, db: Session = Depends(get_db)) -> None:
     """Deactivate a voucher (soft delete) with pessimistic locking."""
     voucher = db.query(Voucher).filter(Voucher.code == code).with_for_update().first()
@@ -100,5 +188,7 @@ def deactivate_voucher(code: str, db: Session = Depends(get_db)) -> None:
             detail=f"Voucher with code '{code}' not found",
         )
 
-    voucher.is_active = False
+    if voucher.is_active:
+        voucher.is_active = False
+        _record_change(db, voucher, ChangeOperation.DEACTIVATED)
     db.commit()
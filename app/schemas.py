@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.models import ChangeOperation
+
 
 class VoucherCreate(BaseModel):
     """Schema for creating a new voucher."""
@@ -39,3 +41,25 @@ class PaginatedVouchersResponse(BaseModel):
     total: int
     skip: int
     limit: int
+
+
+class VoucherChangeResponse(BaseModel):
+    """Schema for a single voucher change feed entry."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    seq: int
+    voucher_id: int
+    code: str
+    operation: ChangeOperation
+    discount_percent: int
+    expires_at: datetime
+    is_active: bool
+    changed_at: datetime
+
+
+class VoucherChangesResponse(BaseModel):
+    """Schema for a page of the voucher change feed."""
+
+    items: list[VoucherChangeResponse]
+    next_since: int = Field(..., description="Pass as `since` to fetch the following changes")
@@ -0,0 +1,140 @@
+"""Production server entry point.
+
+Run with ``python -m app.serve``. Workers default to the number of usable
+CPUs and the total database connection budget is split evenly across them.
+Send SIGHUP to the server process to restart workers one at a time.
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+
+import uvicorn
+
+from app.config import settings
+
+logger = logging.getLogger("app.serve")
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def connection_pools(workers: int) -> int:
+    """Pools alive at once, counting the replacement worker a SIGHUP restart
+    starts before retiring the old one."""
+    return workers + 1 if workers > 1 else workers
+
+
+def fit_workers_to_budget(budget: int, workers: int) -> int:
+    """Largest worker count, up to `workers`, whose pools get one connection each."""
+    while workers > 1 and connection_pools(workers) > budget:
+        workers -= 1
+    return workers
+
+
+def split_connection_budget(budget: int, pools: int) -> int:
+    """Connections each pool may hold so the total stays within budget."""
+    return budget // pools
+
+
+def _override(name: str, value: object) -> None:
+    """Apply a setting to this process and to the worker processes it spawns."""
+    setattr(settings, name, value)
+    os.environ[name.upper()] = str(value)
+
+
+def _preload() -> None:
+    """Import the app and create tables once, before any worker starts."""
+    from app.database import Base, engine
+    from app.main import app  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    _override("create_tables_on_startup", False)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Voucher Management API.")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.web_concurrency or available_cpus(),
+        help="Number of worker processes (default: usable CPUs)",
+    )
+    parser.add_argument(
+        "--db-connection-budget",
+        type=int,
+        default=settings.db_connection_budget,
+        help="Total database connections shared by all workers, including during reloads",
+    )
+    parser.add_argument("--reload", action="store_true", help="Reload on code changes (dev)")
+    parser.add_argument(
+        "--no-preload",
+        dest="preload",
+        action="store_false",
+        help="Let each worker create tables on startup",
+    )
+    args = parser.parse_args(argv)
+    if args.db_connection_budget is not None and args.db_connection_budget < 1:
+        parser.error("--db-connection-budget must be at least 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    workers = 1 if args.reload else max(1, args.workers)
+
+    if args.db_connection_budget is not None:
+        budget = args.db_connection_budget
+        fitted = fit_workers_to_budget(budget, workers)
+        if fitted < workers:
+            logger.warning(
+                "Connection budget %d is too small for %d workers, using %d",
+                budget,
+                workers,
+                fitted,
+            )
+            workers = fitted
+        _override("db_pool_size", split_connection_budget(budget, connection_pools(workers)))
+        _override("db_max_overflow", 0)
+
+    if args.preload:
+        _preload()
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(
+        "Starting %d worker(s) with loop=%s http=%s pool_size=%d max_overflow=%d",
+        workers,
+        loop,
+        http,
+        settings.db_pool_size,
+        settings.db_max_overflow,
+    )
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        reload=args.reload,
+        loop=loop,
+        http=http,
+        backlog=settings.backlog,
+        limit_concurrency=settings.limit_concurrency,
+        timeout_keep_alive=settings.keep_alive_timeout,
+        timeout_graceful_shutdown=settings.graceful_timeout,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
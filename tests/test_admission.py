@@ -0,0 +1,205 @@
+import os
+import threading
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import admission
+from app.admission import TokenBucketLimiter
+from app.config import Settings, settings
+from app.database import get_db
+from app.main import app
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucketLimiter:
+    def test_allows_burst_then_rejects(self) -> None:
+        limiter = TokenBucketLimiter(rate=1, burst=3, clock=FakeClock())
+
+        assert [limiter.acquire("a") for _ in range(3)] == [0, 0, 0]
+        assert limiter.acquire("a") == pytest.approx(1.0)
+
+    def test_refills_over_time(self) -> None:
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=2, burst=1, clock=clock)
+
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") > 0
+        clock.now += 0.5
+        assert limiter.acquire("a") == 0
+
+    def test_keys_are_independent(self) -> None:
+        limiter = TokenBucketLimiter(rate=1, burst=1, clock=FakeClock())
+
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("b") == 0
+        assert limiter.acquire("a") > 0
+
+    def test_evicts_oldest_keys(self) -> None:
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_keys=2, clock=FakeClock())
+
+        for key in ("a", "b", "c"):
+            limiter.acquire(key)
+
+        # "a" was evicted, so it starts again with a full bucket
+        assert limiter.acquire("a") == 0
+
+
+class TestSettingsValidation:
+    @pytest.mark.parametrize(
+        "field, value",
+        [
+            ("rate_limit_per_second", -1),
+            ("rate_limit_burst", 0),
+            ("max_concurrent_requests", 0),
+            ("shed_retry_after", 0),
+        ],
+    )
+    def test_rejects_non_positive_admission_settings(self, field: str, value: int) -> None:
+        with pytest.raises(ValidationError):
+            Settings(**{field: value})
+
+
+class TestRateLimit:
+    def test_rate_limit_returns_429_with_retry_after(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=2))
+        before = admission.stats.rate_limited
+
+        assert client.get("/vouchers/").status_code == 200
+        assert client.get("/vouchers/").status_code == 200
+        response = client.get("/vouchers/")
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+        assert admission.stats.rate_limited == before + 1
+
+    def test_rate_limit_per_route(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+
+        assert client.get("/vouchers/").status_code == 200
+        assert client.get("/vouchers/NOTEXIST").status_code == 404
+        assert client.get("/vouchers/OTHER").status_code == 429
+
+    def test_rate_limit_per_known_api_key(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+        monkeypatch.setattr(settings, "rate_limit_api_keys", {"a", "b"})
+
+        assert client.get("/vouchers/", headers={"X-API-Key": "a"}).status_code == 200
+        assert client.get("/vouchers/", headers={"X-API-Key": "b"}).status_code == 200
+        assert client.get("/vouchers/", headers={"X-API-Key": "a"}).status_code == 429
+
+    def test_rate_limit_unknown_api_keys_share_ip_bucket(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Rotating unknown keys from one IP must not reset the limit."""
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+        monkeypatch.setattr(settings, "rate_limit_api_keys", {"a"})
+
+        assert client.get("/vouchers/", headers={"X-API-Key": "random-1"}).status_code == 200
+        assert client.get("/vouchers/", headers={"X-API-Key": "random-2"}).status_code == 429
+        assert client.get("/vouchers/").status_code == 429
+
+    def test_health_not_rate_limited(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+
+        for _ in range(3):
+            assert client.get("/health").status_code == 200
+
+
+class TestLoadShedding:
+    def test_concurrency_limit_returns_503(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(admission.stats, "in_flight", settings.max_concurrent_requests)
+        before = admission.stats.concurrency_rejected
+
+        response = client.get("/vouchers/")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(settings.shed_retry_after)
+        assert admission.stats.concurrency_rejected == before + 1
+
+    def test_concurrency_slot_released(self, client: TestClient) -> None:
+        before = admission.stats.in_flight
+
+        assert client.get("/vouchers/").status_code == 200
+        assert client.get("/vouchers/NOTEXIST").status_code == 404
+
+        assert admission.stats.in_flight == before
+
+    def test_long_poll_does_not_hold_concurrency_slot(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A pending change feed long-poll should leave in-flight slots for lookups."""
+        monkeypatch.setattr(settings, "max_concurrent_requests", 1)
+        before = admission.stats.in_flight
+        observed: list[int] = []
+        probe = threading.Timer(0.3, lambda: observed.append(admission.stats.in_flight))
+
+        probe.start()
+        response = client.get("/vouchers/changes?wait=0.6")
+        probe.join()
+
+        assert response.status_code == 200
+        assert observed == [before]
+
+    def test_pool_timeout_returns_503(self, client: TestClient, db_session: Session) -> None:
+        """A pool checkout timing out inside the endpoint should shed the request."""
+        exhausted = create_engine(
+            db_session.get_bind().url, pool_size=1, max_overflow=0, pool_timeout=0.1
+        )
+        held = exhausted.connect()
+
+        def exhausted_db() -> Generator[Session, None, None]:
+            session = Session(bind=exhausted)
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = exhausted_db
+        before = admission.stats.pool_timeouts
+        try:
+            response = client.get("/vouchers/")
+        finally:
+            held.close()
+            exhausted.dispose()
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(settings.shed_retry_after)
+        assert admission.stats.pool_timeouts == before + 1
+
+    def test_metrics(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=1))
+        before = client.get("/metrics").json()
+
+        client.get("/vouchers/")
+        client.get("/vouchers/")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pid"] == os.getpid()
+        assert data["rate_limited_requests"] == before["rate_limited_requests"] + 1
+        assert data["in_flight_requests"] == 0
+        assert data["db_pool"]["size"] == settings.db_pool_size
@@ -1,6 +1,11 @@
+import threading
+import time
 from datetime import UTC, datetime, timedelta
 
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import ChangeOperation, Voucher, VoucherChange
 
 
 class TestCreateVoucher:
@@ -385,6 +390,164 @@ class TestDeactivateVoucher:
         assert len(list_response.json()["items"]) == 0
 
 
+class TestVoucherChanges:
+    def test_changes_empty(self, client: TestClient) -> None:
+        response = client.get("/vouchers/changes")
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_since": 0}
+
+    def test_changes_records_mutations_in_order(self, client: TestClient) -> None:
+        expires_at = (datetime.now(UTC) + timedelta(days=30)).isoformat()
+        create_response = client.post(
+            "/vouchers/",
+            json={"discount_percent": 20, "expires_at": expires_at},
+        )
+        code = create_response.json()["code"]
+        client.patch(f"/vouchers/{code}", json={"discount_percent": 30})
+        client.delete(f"/vouchers/{code}")
+
+        response = client.get("/vouchers/changes")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [c["operation"] for c in data["items"]] == ["created", "updated", "deactivated"]
+        assert all(c["code"] == code for c in data["items"])
+        assert data["items"][1]["discount_percent"] == 30
+        assert data["items"][2]["is_active"] is False
+        seqs = [c["seq"] for c in data["items"]]
+        assert seqs == sorted(seqs)
+        assert data["next_since"] == seqs[-1]
+
+    def test_changes_since_returns_only_deltas(self, client: TestClient) -> None:
+        expires_at = (datetime.now(UTC) + timedelta(days=30)).isoformat()
+        client.post("/vouchers/", json={"discount_percent": 10, "expires_at": expires_at})
+        next_since = client.get("/vouchers/changes").json()["next_since"]
+
+        client.post("/vouchers/", json={"discount_percent": 15, "expires_at": expires_at})
+
+        response = client.get(f"/vouchers/changes?since={next_since}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 1
+        assert data["items"][0]["discount_percent"] == 15
+
+    def test_changes_limit(self, client: TestClient) -> None:
+        expires_at = (datetime.now(UTC) + timedelta(days=30)).isoformat()
+        for i in range(3):
+            client.post("/vouchers/", json={"discount_percent": 10 + i, "expires_at": expires_at})
+
+        response = client.get("/vouchers/changes?limit=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["next_since"] == data["items"][-1]["seq"]
+
+    def test_changes_deactivate_inactive_not_recorded(self, client: TestClient) -> None:
+        """Deactivating an already inactive voucher should not add a change."""
+        expires_at = (datetime.now(UTC) + timedelta(days=30)).isoformat()
+        create_response = client.post(
+            "/vouchers/",
+            json={"discount_percent": 20, "expires_at": expires_at},
+        )
+        code = create_response.json()["code"]
+
+        client.delete(f"/vouchers/{code}")
+        client.delete(f"/vouchers/{code}")
+
+        response = client.get("/vouchers/changes")
+        operations = [c["operation"] for c in response.json()["items"]]
+        assert operations == ["created", "deactivated"]
+
+    def test_changes_patch_is_active_records_deactivation(self, client: TestClient) -> None:
+        """Toggling is_active via PATCH should record deactivation and reactivation."""
+        expires_at = (datetime.now(UTC) + timedelta(days=30)).isoformat()
+        create_response = client.post(
+            "/vouchers/",
+            json={"discount_percent": 20, "expires_at": expires_at},
+        )
+        code = create_response.json()["code"]
+
+        client.patch(f"/vouchers/{code}", json={"is_active": False})
+        client.patch(f"/vouchers/{code}", json={"discount_percent": 25})
+        client.patch(f"/vouchers/{code}", json={"is_active": True})
+
+        response = client.get("/vouchers/changes")
+        operations = [c["operation"] for c in response.json()["items"]]
+        assert operations == ["created", "deactivated", "updated", "reactivated"]
+
+    def test_changes_noop_patch_not_recorded(self, client: TestClient) -> None:
+        """A PATCH that leaves every field unchanged should not add a change."""
+        expires_at = (datetime.now(UTC) + timedelta(days=30)).isoformat()
+        create_response = client.post(
+            "/vouchers/",
+            json={"discount_percent": 20, "expires_at": expires_at},
+        )
+        code = create_response.json()["code"]
+
+        client.patch(
+            f"/vouchers/{code}",
+            json={"discount_percent": 20, "expires_at": expires_at, "is_active": True},
+        )
+
+        response = client.get("/vouchers/changes")
+        operations = [c["operation"] for c in response.json()["items"]]
+        assert operations == ["created"]
+
+    def test_changes_long_poll_returns_early_on_new_change(
+        self, client: TestClient, db_session: Session
+    ) -> None:
+        """A pending long-poll should return as soon as a change is committed."""
+
+        def write_change() -> None:
+            with Session(bind=db_session.get_bind()) as writer:
+                voucher = Voucher(
+                    discount_percent=40, expires_at=datetime.now(UTC) + timedelta(days=1)
+                )
+                writer.add(voucher)
+                writer.flush()
+                writer.add(
+                    VoucherChange(
+                        voucher_id=voucher.id,
+                        code=voucher.code,
+                        operation=ChangeOperation.CREATED,
+                        discount_percent=voucher.discount_percent,
+                        expires_at=voucher.expires_at,
+                        is_active=True,
+                    )
+                )
+                writer.commit()
+
+        writer = threading.Timer(0.5, write_change)
+        writer.start()
+        started = time.monotonic()
+        response = client.get("/vouchers/changes?wait=10")
+        elapsed = time.monotonic() - started
+        writer.join()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 1
+        assert data["items"][0]["discount_percent"] == 40
+        assert elapsed < 5
+
+    def test_changes_long_poll_times_out_empty(self, client: TestClient) -> None:
+        response = client.get("/vouchers/changes?wait=0.2")
+
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+
+    def test_changes_wait_max(self, client: TestClient) -> None:
+        response = client.get("/vouchers/changes?wait=31")
+        assert response.status_code == 422
+
+    def test_changes_since_negative(self, client: TestClient) -> None:
+        response = client.get("/vouchers/changes?since=-1")
+        assert response.status_code == 422
+
+
 class TestHealthCheck:
     def test_health_check(self, client: TestClient) -> None:
         response = client.get("/health")
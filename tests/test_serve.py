@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from app import serve
+from app.config import settings
+from app.serve import fit_workers_to_budget, parse_args, split_connection_budget
+
+
+class TestSplitConnectionBudget:
+    def test_split_evenly(self) -> None:
+        assert split_connection_budget(40, 4) == 10
+
+    def test_split_rounds_down_to_stay_within_budget(self) -> None:
+        assert split_connection_budget(10, 3) == 3
+
+
+class TestFitWorkersToBudget:
+    def test_fit_keeps_workers_within_budget(self) -> None:
+        assert fit_workers_to_budget(40, 4) == 4
+
+    def test_fit_reduces_workers_for_small_budget(self) -> None:
+        # 3 workers plus one replacement during reload use all 4 connections
+        assert fit_workers_to_budget(4, 8) == 3
+
+    def test_fit_falls_back_to_single_worker(self) -> None:
+        assert fit_workers_to_budget(2, 8) == 1
+
+
+class TestParseArgs:
+    def test_parse_args_overrides(self) -> None:
+        args = parse_args(["--workers", "3", "--db-connection-budget", "30", "--no-preload"])
+
+        assert args.workers == 3
+        assert args.db_connection_budget == 30
+        assert args.preload is False
+
+    def test_parse_args_defaults_to_at_least_one_worker(self) -> None:
+        args = parse_args([])
+
+        assert args.workers >= 1
+        assert args.preload is True
+
+
+class TestMain:
+    @pytest.fixture
+    def uvicorn_run(self, monkeypatch: pytest.MonkeyPatch) -> dict:
+        """Capture uvicorn.run kwargs and restore pool settings afterwards."""
+        calls: dict = {}
+        monkeypatch.setattr(serve.uvicorn, "run", lambda app, **kwargs: calls.update(kwargs))
+        monkeypatch.setattr(settings, "db_pool_size", settings.db_pool_size)
+        monkeypatch.setattr(settings, "db_max_overflow", settings.db_max_overflow)
+        monkeypatch.setattr(os, "environ", os.environ.copy())
+        return calls
+
+    def test_main_reload_forces_single_worker(self, uvicorn_run: dict) -> None:
+        serve.main(["--workers", "4", "--reload", "--no-preload"])
+
+        assert uvicorn_run["workers"] == 1
+        assert uvicorn_run["reload"] is True
+
+    def test_main_budget_exported_to_workers(self, uvicorn_run: dict) -> None:
+        serve.main(["--workers", "4", "--db-connection-budget", "40", "--no-preload"])
+
+        # 40 connections across 4 workers plus one replacement during reload
+        assert os.environ["DB_POOL_SIZE"] == "8"
+        assert os.environ["DB_MAX_OVERFLOW"] == "0"
+        assert uvicorn_run["workers"] == 4
+
+    def test_main_single_worker_uses_whole_budget(self, uvicorn_run: dict) -> None:
+        serve.main(["--workers", "1", "--db-connection-budget", "10", "--no-preload"])
+
+        assert os.environ["DB_POOL_SIZE"] == "10"
+
+    def test_main_small_budget_reduces_workers(self, uvicorn_run: dict) -> None:
+        serve.main(["--workers", "8", "--db-connection-budget", "4", "--no-preload"])
+
+        assert uvicorn_run["workers"] == 3
+        assert os.environ["DB_POOL_SIZE"] == "1"
+
+    def test_main_rejects_empty_budget(self, uvicorn_run: dict) -> None:
+        with pytest.raises(SystemExit):
+            serve.main(["--db-connection-budget", "0", "--no-preload"])